@@ -1,13 +1,26 @@
 import json
+import time
 import boto3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, Optional, Tuple, List
 
-s3 = boto3.client('s3')
+# S3 client shared across warm invocations, with keep-alive connection pooling.
+# Short timeouts and adaptive retries keep a slow S3 call from eating the API Gateway timeout.
+s3 = boto3.client('s3', config=boto3.session.Config(
+    max_pool_connections=10,
+    tcp_keepalive=True,
+    connect_timeout=1,
+    read_timeout=2,
+    retries={'max_attempts': 2, 'mode': 'adaptive'}
+))
 
 # Constants
 BUCKET_NAME = 'patco-today'
 PRESIGNED_URL_EXPIRATION = 3600  # 1 hour
+PRESIGNED_URL_CACHE_TTL = 3000  # 50 minutes
+FILE_EXISTS_CACHE_TTL = 60  # 1 minute
+RESPONSE_CACHE_MAX_AGE = 300  # 5 minutes
 SPECIAL_SCHEDULE_FILES = ['special_schedule_eastbound.csv', 'special_schedule_westbound.csv']
 WEEKDAY_FILES = ['weekdays-east.csv', 'weekdays-west.csv']
 WEEKEND_FILES = ['saturdays-east.csv', 'saturdays-west.csv', 'sundays-east.csv', 'sundays-west.csv']
@@ -21,6 +34,16 @@ DATE_RANGES = [
     (datetime(2025, 9, 1), datetime(2026, 2, 27), '2025-09-01'),
 ]
 
+# Per-key caches reused across warm invocations: key -> (value, cached_until)
+_presigned_url_cache: Dict[str, Tuple[str, float]] = {}
+_file_exists_cache: Dict[str, Tuple[bool, float]] = {}
+
+# Open the S3 connection during init so the first request doesn't pay for TLS setup
+try:
+    s3.head_bucket(Bucket=BUCKET_NAME)
+except Exception as e:
+    print(f"S3 warm-up failed: {str(e)}")
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Main Lambda handler function."""
     try:
@@ -39,7 +62,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         response_data = {}
         
         # Check for special schedules
-        special_schedules = _get_special_schedules(schedule_date)
+        special_schedules, special_check_failed = _get_special_schedules(schedule_date)
         if special_schedules:
             response_data['special_schedules'] = special_schedules
         
@@ -50,11 +73,19 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Add message
         response_data['message'] = _generate_message(bool(special_schedules), regular_schedules, last_updated)
         
-        return {
+        response = {
             'statusCode': 200,
             'body': json.dumps(response_data)
         }
         
+        # Cached presigned URLs keep the body stable, so let API Gateway/CloudFront and clients
+        # cache it, but never cache a transient regular schedule error or a special schedule
+        # answer that came from a failed S3 check
+        if 'error' not in regular_schedules and not special_check_failed:
+            response['headers'] = {'Cache-Control': f'public, max-age={RESPONSE_CACHE_MAX_AGE}'}
+        
+        return response
+        
     except Exception as e:
         print(f"Error: {str(e)}")
         return {
@@ -72,18 +103,21 @@ def _validate_date(schedule_date: str) -> datetime:
             'body': json.dumps({'error': 'Invalid date format. Use YYYY-MM-DD.'})
         }
 
-def _get_special_schedules(schedule_date: str) -> Optional[Dict[str, Any]]:
-    """Check for and return special schedule URLs if they exist."""
+def _get_special_schedules(schedule_date: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """Check for special schedules, returning their URLs if they exist and whether a check failed."""
     special_base_path = f'schedules/special/{schedule_date}/'
+    pdf_key = f'{special_base_path}special_schedule.pdf'
     
-    # Check if both special schedule files exist
-    files_exist = [
-        _check_file_exists(f'{special_base_path}{filename}')
-        for filename in SPECIAL_SCHEDULE_FILES
-    ]
+    # Check both special schedule files concurrently; most dates have none, so
+    # only look for the PDF once both CSVs are known to exist
+    files_exist, check_failed = _check_files_exist(
+        [f'{special_base_path}{filename}' for filename in SPECIAL_SCHEDULE_FILES]
+    )
     
     if not all(files_exist):
-        return None
+        return None, check_failed
+    
+    pdf_exists, pdf_check_failed = _check_file_exists(pdf_key)
     
     # Generate presigned URLs
     urls = {}
@@ -95,15 +129,14 @@ def _get_special_schedules(schedule_date: str) -> Optional[Dict[str, Any]]:
         urls[url_key] = url
 
     # Add PDF URL key
-    pdf_key = f'{special_base_path}special_schedule.pdf'
-    if _check_file_exists(pdf_key):
+    if pdf_exists:
         urls['pdf_url'] = _generate_presigned_url(pdf_key)
     
     return {
         'schedule_date': schedule_date,
         **urls,
         'expires_in_seconds': PRESIGNED_URL_EXPIRATION
-    }
+    }, check_failed or pdf_check_failed
 
 def _handle_regular_schedules(date: datetime, last_updated: Optional[str]) -> Dict[str, Any]:
     """Handle regular schedules based on whether last_updated is provided."""
@@ -130,7 +163,10 @@ def _check_regular_schedules_for_updates(date: datetime, last_updated_str: str)
             return {'updated': False}
         
         # Files are newer, return URLs
-        urls = _generate_regular_schedule_urls(date)
+        urls, check_failed = _generate_regular_schedule_urls(date)
+        if check_failed:
+            return {'error': 'Could not check regular schedule files'}
+        
         return {
             'updated': True,
             'last_modified': s3_last_modified.strftime('%Y-%m-%d %H:%M:%S'),
@@ -151,7 +187,10 @@ def _get_regular_schedule_urls(date: datetime) -> Dict[str, Any]:
         if isinstance(s3_last_modified, dict):  # Error response
             return {'error': s3_last_modified['error']}
         
-        urls = _generate_regular_schedule_urls(date)
+        urls, check_failed = _generate_regular_schedule_urls(date)
+        if check_failed:
+            return {'error': 'Could not check regular schedule files'}
+        
         return {
             'updated': True,
             'last_modified': s3_last_modified.strftime('%Y-%m-%d %H:%M:%S'),
@@ -162,28 +201,23 @@ def _get_regular_schedule_urls(date: datetime) -> Dict[str, Any]:
     except Exception as e:
         return {'error': f'Error getting regular schedules: {str(e)}'}
 
-def _generate_regular_schedule_urls(date: datetime) -> Dict[str, str]:
-    """Generate presigned URLs for all regular schedule files."""
+def _generate_regular_schedule_urls(date: datetime) -> Tuple[Dict[str, str], bool]:
+    """Generate presigned URLs for all regular schedule files, also returning whether a check failed."""
     regular_path = _get_regular_schedule_path(date)
     urls = {}
     
-    # Generate URLs for weekday files (from date-specific path)
-    for filename in WEEKDAY_FILES:
-        file_key = f'{regular_path}/{filename}'
-        if _check_file_exists(file_key):
-            url = _generate_presigned_url(file_key)
-            url_key = _filename_to_url_key(filename)
-            urls[url_key] = url
+    # Weekday files come from the date-specific path, weekend files from the base regular path
+    files = [(filename, f'{regular_path}/{filename}') for filename in WEEKDAY_FILES]
+    files += [(filename, f'schedules/regular/{filename}') for filename in WEEKEND_FILES]
     
-    # Generate URLs for weekend files (from base regular path)
-    for filename in WEEKEND_FILES:
-        file_key = f'schedules/regular/{filename}'
-        if _check_file_exists(file_key):
+    files_exist, check_failed = _check_files_exist([file_key for _, file_key in files])
+    for (filename, file_key), exists in zip(files, files_exist):
+        if exists:
             url = _generate_presigned_url(file_key)
             url_key = _filename_to_url_key(filename)
             urls[url_key] = url
 
-    return urls
+    return urls, check_failed
 
 def _get_regular_schedule_path(date: datetime) -> str:
     """Determine the file path for regular schedules based on the date."""
@@ -235,17 +269,46 @@ def _filename_to_url_key(filename: str) -> str:
     return filename.replace('.csv', '_url').replace('-', '_')
 
 def _generate_presigned_url(key: str) -> str:
-    """Generate a presigned URL for the given S3 key."""
-    return s3.generate_presigned_url(
+    """Generate a presigned URL for the given S3 key, reusing a cached one when available."""
+    now = time.time()
+    cached = _presigned_url_cache.get(key)
+    if cached and cached[1] > now:
+        return cached[0]
+    
+    # Sign for the cache TTL on top of the advertised expiration so a cached
+    # URL is still valid for at least PRESIGNED_URL_EXPIRATION when served
+    url = s3.generate_presigned_url(
         'get_object',
         Params={'Bucket': BUCKET_NAME, 'Key': key},
-        ExpiresIn=PRESIGNED_URL_EXPIRATION
+        ExpiresIn=PRESIGNED_URL_EXPIRATION + PRESIGNED_URL_CACHE_TTL
     )
+    _presigned_url_cache[key] = (url, now + PRESIGNED_URL_CACHE_TTL)
+    return url
 
-def _check_file_exists(key: str) -> bool:
-    """Check if a file exists in S3."""
+def _check_file_exists(key: str) -> Tuple[bool, bool]:
+    """Check if a file exists in S3, returning (exists, check_failed) and reusing a recent result when available."""
+    now = time.time()
+    cached = _file_exists_cache.get(key)
+    if cached and cached[1] > now:
+        return cached[0], False
+    
     try:
         s3.head_object(Bucket=BUCKET_NAME, Key=key)
-        return True
-    except Exception:
-        return False
+        exists = True
+    except s3.exceptions.ClientError as e:
+        if e.response['Error']['Code'] not in ['404', 'NotFound']:
+            print(f"Error checking {key}: {str(e)}")
+            return False, True
+        exists = False
+    except Exception as e:
+        # Throttling, timeouts and credential errors say nothing about the file, so don't cache them
+        print(f"Error checking {key}: {str(e)}")
+        return False, True
+    _file_exists_cache[key] = (exists, now + FILE_EXISTS_CACHE_TTL)
+    return exists, False
+
+def _check_files_exist(keys: List[str]) -> Tuple[List[bool], bool]:
+    """Check whether each of the given S3 keys exists concurrently, returning the results and whether any check failed."""
+    with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+        results = list(executor.map(_check_file_exists, keys))
+    return [exists for exists, _ in results], any(failed for _, failed in results)
@@ -11,6 +11,10 @@ from datetime import datetime, timezone
 # Use a requests session for connection reuse
 requests_session = requests.Session()
 
+# Parsed schedule pages kept across warm invocations, keyed by URL:
+# url -> (etag, last_modified, soup)
+page_cache = {}
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
@@ -18,7 +22,10 @@ logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
 # Initialize S3 client with connection pooling
 s3_client = boto3.client('s3', config=boto3.session.Config(
     max_pool_connections=10,
-    retries={'max_attempts': 2}
+    retries={'max_attempts': 2, 'mode': 'adaptive'},
+    tcp_keepalive=True,
+    connect_timeout=1,
+    read_timeout=2
 ))
 
 # Instantiate variables
@@ -31,6 +38,7 @@ USER_AGENT = (
     'AppleWebKit/537.36 (KHTML, like Gecko) '
     'Chrome/91.0.4472.124 Safari/537.36'
 )
+PDF_SUFFIXES = ('.pdf', '.PDF')
 
 def lambda_handler(event, context):
     """
@@ -41,9 +49,7 @@ def lambda_handler(event, context):
     headers = {'User-Agent': USER_AGENT}
 
     try:
-        response = requests_session.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = get_schedule_page(url, headers)
 
         # Parse all <b> and <h2> tags once for reuse
         b_tags = soup.find_all('b')
@@ -82,7 +88,7 @@ def lambda_handler(event, context):
         s3_client.put_object(
             Bucket='patco-today',
             Key=s3_key,
-            Body=json.dumps(response_payload, indent=2).encode('utf-8'),
+            Body=json.dumps(response_payload, separators=(',', ':')).encode('utf-8'),
             ContentType='application/json',
             Metadata={
                 'execution_time': today.isoformat(),
@@ -97,6 +103,31 @@ def lambda_handler(event, context):
     
     return response_payload
 
+def get_schedule_page(url, headers):
+    """Fetches and parses the schedules page, reusing the cached tree when it is unchanged."""
+    cached = page_cache.get(url)
+    request_headers = dict(headers)
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            request_headers['If-None-Match'] = etag
+        if last_modified:
+            request_headers['If-Modified-Since'] = last_modified
+
+    response = requests_session.get(url, headers=request_headers, timeout=10)
+    if response.status_code == 304 and cached:
+        logger.info("Schedules page not modified, reusing cached parse")
+        return cached[2]
+
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, 'html.parser')
+
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        page_cache[url] = (etag, last_modified, soup)
+    return soup
+
 def get_regular_schedule_effective_date_and_pdf(soup, base_url, b_tags=None):
     """Extracts the effective date and PDF link of the regular schedule from the page."""
     b_tags = b_tags if b_tags is not None else soup.find_all('b')
@@ -110,7 +141,7 @@ def get_regular_schedule_effective_date_and_pdf(soup, base_url, b_tags=None):
             pdf_url = None
             if parent:
                 a_tag = parent.find('a', href=True)
-                if a_tag and a_tag['href'].lower().endswith('.pdf'):
+                if a_tag and a_tag['href'].endswith(PDF_SUFFIXES):
                     href = a_tag['href']
                     # Remove leading ".." and join with base url
                     href = re.sub(r'^\.\./', '/', href)
@@ -132,7 +163,7 @@ def get_today_special_schedule(soup, today, h2_tags=None):
     # First try: Look for date in link text (existing logic)
     for li in ul.find_all('li'):
         a = li.find('a', href=True)
-        if a and a['href'].lower().endswith('.pdf'):
+        if a and a['href'].endswith(PDF_SUFFIXES):
             link_text = a.get_text(strip=True)
             date_match = re.search(r'([A-Za-z]+,\s*)?([A-Za-z]+ \d{1,2}, \d{4})', link_text)
             if date_match:
@@ -153,7 +184,7 @@ def get_today_special_schedule(soup, today, h2_tags=None):
     target_date_str = today.strftime('%Y-%m-%d')
     for li in ul.find_all('li'):
         a = li.find('a', href=True)
-        if a and a['href'].lower().endswith('.pdf'):
+        if a and a['href'].endswith(PDF_SUFFIXES):
             href = a['href']
             tw_match = re.search(r'TW_(\d{4}-\d{2}-\d{2})\.pdf', href)
             if tw_match and tw_match.group(1) == target_date_str:
@@ -177,7 +208,7 @@ def get_today_special_schedule(soup, today, h2_tags=None):
 
     for li in ul.find_all('li'):
         a = li.find('a', href=True)
-        if a and a['href'].lower().endswith('.pdf'):
+        if a and a['href'].endswith(PDF_SUFFIXES):
             href = a['href']
             for pattern in date_patterns:
                 if pattern in href:
@@ -8,40 +8,70 @@ import logging
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
 
-import boto3
 import fitz  # PyMuPDF
-import requests
 
 # Add the project root to the path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from utils.aws import get_client
 from utils.config import load_config
+from utils.http_session import get_session
 from utils.logger import setup_logging
 
-def combine_schedule_lines(text):
+# Patterns used by the per-line text processing, compiled once at import
+TIME_WITH_SUFFIX_RE = re.compile(r'\d{1,2}:\d{2}[AP]')
+TIME_SPACED_SUFFIX_RE = re.compile(r'\d{1,2}:\d{2}\s?[AP]')
+TIME_NO_SUFFIX_RE = re.compile(r'^\d{1,2}:\d{2}$')
+TIME_COMMA_RE = re.compile(r'(\d{1,2}:\d{2}[AP])')
+CLOSED_RE = re.compile(r'(?<!,)CLOSED')
+MULTI_COMMA_RE = re.compile(r',+')
+DATE_RE = re.compile(r'(\w+), (\w+ \d{1,2}, \d{4})')
+
+# Characters dropped from every line before parsing
+STRIP_TABLE = str.maketrans({"►": None, " ": None, "\t": None})
+
+# Upper bound on worker processes used to extract PDF pages
+EXTRACT_WORKERS = min(os.cpu_count() or 1, 4)
+
+def extract_page_text(pdf_content, page_index):
+    """Extracts the text of a single PDF page in a worker process."""
+    with fitz.open(stream=BytesIO(pdf_content), filetype="pdf") as doc:
+        return doc[page_index].get_text()
+
+def extract_pdf_text(pdf_content):
+    """Extracts the text of all PDF pages, in parallel when there is more than one."""
+    with fitz.open(stream=BytesIO(pdf_content), filetype="pdf") as doc:
+        page_count = doc.page_count
+        if page_count <= 1 or EXTRACT_WORKERS == 1:
+            return "".join(page.get_text() for page in doc)
+
+    workers = min(EXTRACT_WORKERS, page_count)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return "".join(executor.map(extract_page_text, [pdf_content] * page_count, range(page_count)))
+
+def combine_schedule_lines(lines):
     """
     Combines fragmented schedule lines from the PDF text extraction into single lines.
     It joins consecutive lines containing time-like patterns until a line has
     approximately 14 time entries, which corresponds to a full schedule row.
     """
-    lines = text.split('\n')
     combined_lines = []
     schedule_buffer = ""
-    time_pattern = r'\d{1,2}:\d{2}\s?[AP]'
 
     for line in lines:
         # Normalize line for pattern matching by removing extra spaces
         line_for_match = line.replace(" ", "")
 
         # If the line contains what looks like schedule times
-        if re.search(r'\d{1,2}:\d{2}[AP]', line_for_match):
+        if TIME_WITH_SUFFIX_RE.search(line_for_match):
             schedule_buffer += " " + line.strip()
             # Count times in the buffer
-            time_count = len(re.findall(time_pattern, schedule_buffer))
+            time_count = len(TIME_SPACED_SUFFIX_RE.findall(schedule_buffer))
 
             if time_count >= 14:
                 combined_lines.append(schedule_buffer.strip())
@@ -58,138 +88,79 @@ def combine_schedule_lines(text):
     if schedule_buffer:
         combined_lines.append(schedule_buffer.strip())
 
-    return '\n'.join(combined_lines)
+    return combined_lines
 
-def process_text(text):
-    """Clean and format extracted PDF text into CSV format."""
-    # Step 1: Replace special characters with CLOSED
+def process_text(lines):
+    """Clean and format extracted PDF text lines into CSV rows."""
     # Step 0: Combine multi-line schedule entries into single lines
-    text = combine_schedule_lines(text)
+    lines = combine_schedule_lines(lines)
 
     # Step 1: Replace special characters and remove whitespace/tabs
-    text = text.replace("►", "")
-    text = text.replace("à", "CLOSED,")
-    
-    # Step 2: Remove whitespace and tabs
-    text = text.replace(" ", "")
-    text = text.replace("\t", "")
-    
-    # Step 3: Add commas after time patterns (e.g., "12:34A" -> "12:34A,")
-
     # Step 2: Add commas after time patterns (e.g., "12:34A" -> "12:34A,")
-    text = re.sub(r'(\d{1,2}:\d{2}[AP])', r'\1,', text)
-    
-    # Step 4: Filter lines to keep only valid schedule data
+    lines = [
+        TIME_COMMA_RE.sub(r'\1,', line.translate(STRIP_TABLE).replace("à", "CLOSED,"))
+        for line in lines
+    ]
 
-    # Subsequent processing steps
-    text = filter_valid_lines(text)
+    # Step 3: Filter lines to keep only valid schedule data
+    lines = filter_valid_lines(lines)
     
-    # Step 5: Fix CLOSED entries that need comma separation
-    text = fix_closed_formatting(text)
+    # Step 4: Fix CLOSED separators and missing A/P suffixes, and ensure each
+    # line has exactly 14 columns, in a single pass per line
+    lines = [normalize_line(line) for line in lines]
     
-    # Step 6: Fix missing A/P suffixes in time entries
-    text = fix_missing_am_pm(text)
-    
-    # Step 7: Ensure each line has exactly 14 columns
-    text = normalize_to_14_columns(text)
-    
-    # Log the final processed text line by line for debugging
-    logging.info("--- Text after processing (line by line) ---")
-    for i, line in enumerate(text.split('\n')):
-        logging.info(f"Processed line {i+1}: {line}")
-    logging.info("--------------------------------------------")
+    # Log the final processed text line by line for debugging, as a single record
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(
+            "--- Text after processing (line by line) ---\n%s\n--------------------------------------------",
+            "\n".join(f"Processed line {i+1}: {line}" for i, line in enumerate(lines))
+        )
 
-    return text
+    return lines
 
-def filter_valid_lines(text):
-    """Keep only lines that contain valid schedule data (numbers, times, CLOSED)."""
-    lines = text.split('\n')
-    filtered_lines = []
-    
-    for line in lines:
-        # Skip empty lines
-        if not line.strip():
-            continue
-        
-        # Keep lines that contain time patterns or CLOSED
-        if re.search(r'\d{1,2}:\d{2}[AP]?', line) or 'CLOSED' in line:
-            # Make sure it has some comma-separated structure
-            if ',' in line or re.search(r'\d', line):
-                filtered_lines.append(line)
+def looks_like_schedule_line(line):
+    """Checks for a time (digit, colon, two digits) or a CLOSED marker without using regex."""
+    colon = line.find(':')
+    while colon != -1:
+        if colon > 0 and line[colon - 1].isdecimal() and len(line[colon + 1:colon + 3]) == 2 and line[colon + 1:colon + 3].isdecimal():
+            return True
+        colon = line.find(':', colon + 1)
     
-    return '\n'.join(filtered_lines)
+    # Make sure a CLOSED line has some comma-separated structure
+    return 'CLOSED' in line and (',' in line or any(c.isdecimal() for c in line))
 
-def fix_closed_formatting(text):
-    """Add commas before CLOSED when it's not at the beginning or already preceded by comma."""
-    lines = text.split('\n')
-    fixed_lines = []
-    
-    for line in lines:
-        # Add comma before CLOSED if not already there
-        line = re.sub(r'(?<!,)CLOSED', r',CLOSED', line)
-        # Clean up any double commas
-        line = re.sub(r',+', ',', line)
-        fixed_lines.append(line)
-    
-    return '\n'.join(fixed_lines)
+def filter_valid_lines(lines):
+    """Keep only lines that contain valid schedule data (numbers, times, CLOSED)."""
+    return [line for line in lines if line.strip() and looks_like_schedule_line(line)]
 
-def fix_missing_am_pm(text):
-    """Fix missing AM/PM suffixes in time entries."""
-    lines = text.split('\n')
-    fixed_lines = []
+def normalize_line(line):
+    """Fix CLOSED separators and missing AM/PM suffixes, then pad or trim the row to 14 columns."""
+    # Add comma before CLOSED if not already there, then clean up any double commas
+    line = MULTI_COMMA_RE.sub(',', CLOSED_RE.sub(r',CLOSED', line))
+    columns = [col.strip() for col in line.split(',')]
     
-    for line in lines:
-        columns = line.split(',')
-        
-        for i, col in enumerate(columns):
-            col = col.strip()
-            # If it looks like a time but missing AM/PM
-            if re.match(r'^\d{1,2}:\d{2}$', col):
-                # Infer AM/PM based on context
-                suffix = infer_am_pm_suffix(columns, i)
-                columns[i] = col + suffix
-        
-        fixed_lines.append(','.join(columns))
+    # Times in a row run in one direction, so carry the last seen A/P suffix
+    # forward, seeded from the first suffixed time (default 'A')
+    suffix = next((col[-1] for col in columns if TIME_WITH_SUFFIX_RE.search(col)), 'A')
+    for i, col in enumerate(columns):
+        if TIME_NO_SUFFIX_RE.match(col):
+            columns[i] = col + suffix
+        elif TIME_WITH_SUFFIX_RE.search(col):
+            suffix = col[-1]
     
-    return '\n'.join(fixed_lines)
-
-def infer_am_pm_suffix(columns, current_index):
-    """Infer AM/PM suffix based on surrounding times."""
-    # Look for nearby times with AM/PM to infer
-    for i in range(max(0, current_index - 2), min(len(columns), current_index + 3)):
-        if i != current_index:
-            col = columns[i].strip()
-            if re.search(r'\d{1,2}:\d{2}[AP]', col):
-                return col[-1]  # Return 'A' or 'P'
+    # Remove empty columns
+    columns = [col for col in columns if col]
     
-    # Default to 'A' if we can't infer
-    return 'A'
-
-def normalize_to_14_columns(text):
-    """Ensure each line has exactly 14 columns."""
-    lines = text.split('\n')
-    normalized_lines = []
+    # Pad or trim to 14 columns
+    if len(columns) < 14:
+        columns.extend(['CLOSED'] * (14 - len(columns)))
+    elif len(columns) > 14:
+        columns = columns[:14]
     
-    for line in lines:
-        columns = [col.strip() for col in line.split(',')]
-        
-        # Remove empty columns
-        columns = [col for col in columns if col]
-        
-        # Pad or trim to 14 columns
-        if len(columns) < 14:
-            columns.extend(['CLOSED'] * (14 - len(columns)))
-        elif len(columns) > 14:
-            columns = columns[:14]
-        
-        normalized_lines.append(','.join(columns))
-    
-    return '\n'.join(normalized_lines)
+    return ','.join(columns)
 
-def split_westbound_eastbound(text):
-    """Split text into westbound and eastbound schedules."""
-    lines = text.split('\n')
-    
+def split_westbound_eastbound(lines):
+    """Split schedule lines into westbound and eastbound schedules, reversing eastbound columns."""
     # Look for section headers or try to split roughly in half
     westbound_lines = []
     eastbound_lines = []
@@ -211,20 +182,37 @@ def split_westbound_eastbound(text):
         westbound_lines = lines[:mid_point]
         eastbound_lines = lines[mid_point:]
     
-    westbound_text = clean_empty_lines(westbound_lines)
-    eastbound_text = clean_empty_lines(eastbound_lines)
+    # Eastbound rows are stored with their columns reversed
+    eastbound_lines = [','.join(line.split(',')[::-1]) for line in clean_empty_lines(eastbound_lines)]
     
-    return westbound_text, eastbound_text
+    return clean_empty_lines(westbound_lines), eastbound_lines
 
 def clean_empty_lines(lines):
-    """Remove empty lines and return as text."""
-    return '\n'.join([line for line in lines if line.strip()])
+    """Remove empty lines."""
+    return [line for line in lines if line.strip()]
+
+def parse_schedule_date(special_text):
+    """Parse the date from text like "Saturday, August 16, 2025 ...", or return None."""
+    # Fast path: the weekday leads the text, so the date is the next three words
+    try:
+        return datetime.strptime(' '.join(special_text.split(', ', 1)[1].split()[:3]), "%B %d, %Y")
+    except (IndexError, ValueError):
+        pass
+    
+    # Otherwise look for the date anywhere in the text
+    date_match = DATE_RE.search(special_text)
+    if date_match:
+        try:
+            return datetime.strptime(date_match.group(2), "%B %d, %Y")
+        except ValueError:
+            pass
+    return None
 
-def add_difference_flags(special_schedule_text, direction):
+def add_difference_flags(special_schedule_lines, direction):
     """Add difference flags by comparing with regular schedules."""
-    # For now, just return the text as-is
+    # For now, just return the lines as-is
     # In a full implementation, you'd compare with regular schedule files
-    return special_schedule_text
+    return special_schedule_lines
 
 def main():
     """Main function to convert PDF to CSV."""
@@ -245,7 +233,7 @@ def main():
         sys.exit(1)
     
     # Initialize S3 client
-    s3_client = boto3.client('s3', region_name=config['aws_region'])
+    s3_client = get_client('s3', config['aws_region'])
     bucket = config['s3_bucket']
     
     try:
@@ -263,67 +251,46 @@ def main():
             'Sec-Fetch-Mode': 'navigate',
             'Sec-Fetch-Site': 'same-origin'
         }
-        response = requests.get(pdf_url, headers=headers, timeout=config['timeout_seconds'])
+        response = get_session().get(pdf_url, headers=headers, timeout=config['timeout_seconds'])
         response.raise_for_status()
         pdf_content = response.content
         
         # Convert PDF to text using PyMuPDF
-        logging.info('Converting PDF to text using PyMuPDF')
-        pdf_file = BytesIO(pdf_content)
-        doc = fitz.open(stream=pdf_file, filetype="pdf")
-        
-        # Extract text from all pages
-        logging.info('Extracting text from all PDF pages')
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        
-        doc.close()
-        # Log the raw text before processing for debugging
-        logging.info("--- Raw text from PDF before processing ---")
-        for i, line in enumerate(text.split('\n')):
-            logging.info(f"Raw line {i+1}: {line}")
-        logging.info("-------------------------------------------")
+        logging.info('Extracting text from all PDF pages using PyMuPDF')
+        text = extract_pdf_text(pdf_content)
+        lines = text.splitlines()
+
+        # Log the raw text before processing for debugging, as a single record
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                "--- Raw text from PDF before processing ---\n%s\n-------------------------------------------",
+                "\n".join(f"Raw line {i+1}: {line}" for i, line in enumerate(lines))
+            )
         
         # Clean and format the extracted text
         logging.info('Processing extracted text')
-        text = process_text(text)
+        lines = process_text(lines)
         
-        # Split into westbound and eastbound schedules
+        # Split into westbound and eastbound schedules, with eastbound columns reversed
         logging.info('Splitting text into westbound and eastbound schedules')
-        westbound_text, eastbound_text = split_westbound_eastbound(text)
-
-        # Reverse each line in eastbound data
-        logging.info('Reversing each line in eastbound schedule')
-        eastbound_lines = eastbound_text.split('\n') if eastbound_text else []
-        reversed_eastbound_lines = []
-        for line in eastbound_lines:
-            columns = line.split(',')
-            reversed_columns = list(reversed(columns))
-            reversed_eastbound_lines.append(','.join(reversed_columns))
-        eastbound_text = '\n'.join(reversed_eastbound_lines)
+        westbound_lines, eastbound_lines = split_westbound_eastbound(lines)
 
         # Compare with regular schedules and add difference flags
         logging.info('Comparing special schedules with regular schedules')
-        westbound_text = add_difference_flags(westbound_text, 'west')
-        eastbound_text = add_difference_flags(eastbound_text, 'east')
+        westbound_lines = add_difference_flags(westbound_lines, 'west')
+        eastbound_lines = add_difference_flags(eastbound_lines, 'east')
 
         # Get the date from special_schedule_text
-        special_text = schedule_info.get('special_schedule_text', '')
-        date_match = re.search(r'(\w+), (\w+ \d{1,2}, \d{4})', special_text)
-        if date_match:
-            date_obj = datetime.strptime(date_match.group(2), "%B %d, %Y")
-            schedule_date = date_obj.strftime("%Y-%m-%d")
-        else:
-            # fallback to today
-            schedule_date = datetime.now().strftime("%Y-%m-%d")
+        date_obj = parse_schedule_date(schedule_info.get('special_schedule_text', ''))
+        # fallback to today
+        schedule_date = (date_obj or datetime.now()).strftime("%Y-%m-%d")
 
         # Upload westbound schedule
         westbound_key = f'schedules/special/{schedule_date}/special_schedule_westbound.csv'
         s3_client.put_object(
             Bucket=bucket,
             Key=westbound_key,
-            Body=westbound_text.encode('utf-8'),
+            Body=b'\n'.join(line.encode('utf-8') for line in westbound_lines),
             ContentType='text/csv'
         )
         logging.info(f'Uploaded westbound schedule to {westbound_key}')
@@ -333,7 +300,7 @@ def main():
         s3_client.put_object(
             Bucket=bucket,
             Key=eastbound_key,
-            Body=eastbound_text.encode('utf-8'),
+            Body=b'\n'.join(line.encode('utf-8') for line in eastbound_lines),
             ContentType='text/csv'
         )
         logging.info(f'Uploaded eastbound schedule to {eastbound_key}')
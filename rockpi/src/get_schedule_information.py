@@ -7,19 +7,38 @@ import json
 import logging
 import os
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 
-import boto3
 import requests
 from bs4 import BeautifulSoup
 
 # Add the project root to the path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from utils.aws import get_client
 from utils.config import load_config
+from utils.http_session import get_session
 from utils.logger import setup_logging
 
+# Static request headers for PDF downloads; the User-Agent comes from config
+PDF_HEADERS = {
+    'Accept': 'application/pdf,application/octet-stream,*/*;q=0.9',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'same-origin'
+}
+
+def is_pdf_href(href):
+    """Checks whether a link href points to a PDF."""
+    return href is not None and href.endswith('.pdf')
+
 def get_regular_schedule_effective_date_and_pdf(soup, base_url):
     """Extracts the effective date and PDF link of the regular schedule from the page."""
     for b in soup.find_all('b'):
@@ -29,7 +48,7 @@ def get_regular_schedule_effective_date_and_pdf(soup, base_url):
             link = None
             parent = b.parent
             while parent and not link:
-                link = parent.find('a', href=lambda x: x and x.endswith('.pdf'))
+                link = parent.find('a', href=is_pdf_href)
                 parent = parent.parent
             
             if link:
@@ -50,66 +69,64 @@ def get_today_special_schedule(soup, today):
     if not ul:
         return None, None
 
-    # First try: Look for date in link text (existing logic)
-    for li in ul.find_all('li'):
-        li_text = li.get_text()
-        if today.strftime('%B %d') in li_text:  # e.g., "August 13"
-            link = li.find('a', href=lambda x: x and x.endswith('.pdf'))
-            if link:
-                return link.get('href'), li_text
-
-    # Second try: Look for TW_yyyy-mm-dd.pdf format in href
-    target_date_str = today.strftime('%Y-%m-%d')
-    for li in ul.find_all('li'):
-        link = li.find('a', href=lambda x: x and f'TW_{target_date_str}.pdf' in x)
-        if link:
-            return link.get('href'), li.get_text()
-
-    # Third try: Look for any PDF containing today's date in various formats
-    date_patterns = [
+    month_day = today.strftime('%B %d')  # e.g., "August 13"
+    tw_filename = f"TW_{today.strftime('%Y-%m-%d')}.pdf"
+    date_patterns = (
         today.strftime('%Y-%m-%d'),
         today.strftime('%Y_%m_%d'),
         today.strftime('%m-%d-%Y'),
         today.strftime('%m_%d_%Y'),
         today.strftime('%d-%m-%Y'),
         today.strftime('%d_%m_%Y'),
-    ]
-    
+    )
+
+    # Walk the list once, in priority order: date in link text wins outright,
+    # then a TW_yyyy-mm-dd.pdf href, then any PDF href containing today's date
+    tw_match = None
+    pattern_match = None
     for li in ul.find_all('li'):
-        link = li.find('a', href=lambda x: x and x.endswith('.pdf'))
-        if link:
-            href = link.get('href')
-            if any(pattern in href for pattern in date_patterns):
-                return href, li.get_text()
+        li_text = li.get_text()
+        link = li.find('a', href=is_pdf_href)
+        if link and month_day in li_text:
+            return link.get('href'), li_text
 
-    return None, None
+        if tw_match is None:
+            tw_link = li.find('a', href=lambda x: x and tw_filename in x)
+            if tw_link:
+                tw_match = (tw_link.get('href'), li_text)
+
+        if pattern_match is None and link and any(pattern in link.get('href') for pattern in date_patterns):
+            pattern_match = (link.get('href'), li_text)
+
+    return tw_match or pattern_match or (None, None)
 
 def save_special_schedule_to_s3(pdf_url, date_str, s3_client, bucket):
     """Downloads and saves special schedule PDF to S3."""
+    s3_key = f'schedules/special/{date_str}/special_schedule.pdf'
+
+    # Skip the download if an earlier run today already stored the PDF
     try:
-        headers = {
-            'User-Agent': load_config()['user_agent'],
-            'Accept': 'application/pdf,application/octet-stream,*/*;q=0.9',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'same-origin'
-        }
-        response = requests.get(pdf_url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        s3_key = f'schedules/special/{date_str}/special_schedule.pdf'
-        s3_client.put_object(
-            Bucket=bucket,
-            Key=s3_key,
-            Body=response.content,
-            ContentType='application/pdf'
-        )
-        
+        s3_client.head_object(Bucket=bucket, Key=s3_key)
+        logging.info(f"Special schedule PDF already exists in S3: {s3_key}")
+        return True
+    except s3_client.exceptions.ClientError as e:
+        if e.response['Error']['Code'] not in ['404', 'NotFound']:
+            logging.error(f"S3 access error: {e}")
+            return False
+
+    try:
+        headers = {'User-Agent': load_config()['user_agent'], **PDF_HEADERS}
+        # Stream the PDF body straight into S3 instead of buffering it in memory
+        with get_session().get(pdf_url, headers=headers, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            s3_client.upload_fileobj(
+                response.raw,
+                bucket,
+                s3_key,
+                ExtraArgs={'ContentType': 'application/pdf'}
+            )
+
         logging.info(f"Special schedule PDF saved to S3: {s3_key}")
         return True
     except requests.exceptions.RequestException as e:
@@ -168,14 +185,13 @@ def main():
     }
     
     # Initialize S3 client
-    s3_client = boto3.client('s3', region_name=config['aws_region'])
+    s3_client = get_client('s3', config['aws_region'])
     bucket = config['s3_bucket']
     
     try:
         logging.info(f"Scraping schedule information from {url}")
         
         # Add a small delay to avoid looking too automated
-        import time
         time.sleep(2)
         
         # Create a session for better persistence
@@ -206,7 +222,7 @@ def main():
                         time.sleep(delay)
                         continue
                 raise
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
 
         # Get regular schedule information
         regular_schedule_effective_date, regular_schedule_pdf_url = get_regular_schedule_effective_date_and_pdf(soup, url)
@@ -5,7 +5,6 @@ Sends periodic heartbeat signals to AWS CloudWatch for monitoring uptime.
 Cost: ~$0.30-0.50/month for custom metrics
 """
 
-import boto3
 import json
 import logging
 import os
@@ -16,18 +15,24 @@ from botocore.exceptions import ClientError, BotoCoreError
 
 # Add utils to path for shared modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'utils'))
-from logger import setup_logger
-from config import load_config
+from logger import setup_logging
+from aws import get_client
+from sysinfo import memory_used_percent, read_proc
+
+# Heartbeat settings live in their own file next to config.json
+HEARTBEAT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config_heartbeat.json')
 
 class HeartbeatMonitor:
-    def __init__(self, config_path='../config.json'):
+    def __init__(self, config_path=HEARTBEAT_CONFIG_PATH):
         """Initialize the heartbeat monitor with configuration."""
-        self.logger = setup_logger('heartbeat_monitor')
-        self.config = load_config(config_path)
+        with open(config_path, 'r') as f:
+            self.config = json.load(f)
+        setup_logging(self.config.get('logging', {}).get('level', 'INFO'))
+        self.logger = logging.getLogger('heartbeat_monitor')
         
         # AWS clients
         try:
-            self.cloudwatch = boto3.client('cloudwatch', region_name='us-east-1')
+            self.cloudwatch = get_client('cloudwatch', 'us-east-1')
             self.logger.info("AWS CloudWatch client initialized successfully")
         except Exception as e:
             self.logger.error(f"Failed to initialize AWS clients: {e}")
@@ -37,6 +42,8 @@ class HeartbeatMonitor:
         self.device_id = self.config.get('device_id', 'rockpi-4b-plus')
         self.metric_namespace = self.config.get('metric_namespace', 'RockPi/Heartbeat')
         self.metric_name = self.config.get('heartbeat_metric_name', 'DeviceUptime')
+        self.dimensions = [{'Name': 'DeviceId', 'Value': self.device_id}]
+        self.interval_seconds = int(self.config.get('heartbeat_interval_hours', 6) * 3600)
         
     def send_heartbeat(self):
         """Send a heartbeat metric to CloudWatch."""
@@ -49,14 +56,10 @@ class HeartbeatMonitor:
                 MetricData=[
                     {
                         'MetricName': self.metric_name,
-                        'Dimensions': [
-                            {
-                                'Name': 'DeviceId',
-                                'Value': self.device_id
-                            }
-                        ],
+                        'Dimensions': self.dimensions,
                         'Value': 1.0,  # Simple alive signal
                         'Unit': 'Count',
+                        'StorageResolution': 60,
                         'Timestamp': timestamp
                     }
                 ]
@@ -86,22 +89,12 @@ class HeartbeatMonitor:
             with open('/proc/loadavg', 'r') as f:
                 load_avg = f.readline().split()[:3]
             
-            # Get memory info
-            memory_info = {}
-            with open('/proc/meminfo', 'r') as f:
-                for line in f:
-                    if line.startswith(('MemTotal:', 'MemAvailable:', 'MemFree:')):
-                        key, value = line.split(':')
-                        memory_info[key.strip()] = int(value.strip().split()[0])
-            
             return {
                 'uptime_hours': round(uptime_seconds / 3600, 2),
                 'load_avg_1min': float(load_avg[0]),
                 'load_avg_5min': float(load_avg[1]),
                 'load_avg_15min': float(load_avg[2]),
-                'memory_used_percent': round(
-                    (memory_info['MemTotal'] - memory_info['MemAvailable']) / memory_info['MemTotal'] * 100, 2
-                )
+                'memory_used_percent': memory_used_percent(read_proc('/proc/meminfo'))
             }
         except Exception as e:
             self.logger.warning(f"Could not gather system info: {e}")
@@ -116,9 +109,10 @@ class HeartbeatMonitor:
             metrics = [
                 {
                     'MetricName': self.metric_name,
-                    'Dimensions': [{'Name': 'DeviceId', 'Value': self.device_id}],
+                    'Dimensions': self.dimensions,
                     'Value': 1.0,
                     'Unit': 'Count',
+                    'StorageResolution': 60,
                     'Timestamp': timestamp
                 }
             ]
@@ -128,27 +122,30 @@ class HeartbeatMonitor:
                 if 'uptime_hours' in system_info:
                     metrics.append({
                         'MetricName': 'SystemUptime',
-                        'Dimensions': [{'Name': 'DeviceId', 'Value': self.device_id}],
+                        'Dimensions': self.dimensions,
                         'Value': system_info['uptime_hours'],
                         'Unit': 'Count',
+                        'StorageResolution': 60,
                         'Timestamp': timestamp
                     })
                 
                 if 'load_avg_1min' in system_info:
                     metrics.append({
                         'MetricName': 'LoadAverage',
-                        'Dimensions': [{'Name': 'DeviceId', 'Value': self.device_id}],
+                        'Dimensions': self.dimensions,
                         'Value': system_info['load_avg_1min'],
                         'Unit': 'None',
+                        'StorageResolution': 60,
                         'Timestamp': timestamp
                     })
                 
                 if 'memory_used_percent' in system_info:
                     metrics.append({
                         'MetricName': 'MemoryUsagePercent',
-                        'Dimensions': [{'Name': 'DeviceId', 'Value': self.device_id}],
+                        'Dimensions': self.dimensions,
                         'Value': system_info['memory_used_percent'],
                         'Unit': 'Percent',
+                        'StorageResolution': 60,
                         'Timestamp': timestamp
                     })
             
@@ -168,11 +165,34 @@ class HeartbeatMonitor:
             self.logger.error(f"Error sending enhanced heartbeat: {e}")
             # Fallback to simple heartbeat
             return self.send_heartbeat()
+    
+    def run_forever(self, interval):
+        """Send a heartbeat every interval seconds, reusing one client and connection."""
+        while True:
+            self.send_enhanced_heartbeat()
+            # Sleep to the next interval boundary so sends don't drift
+            time.sleep(interval - (time.time() % interval))
 
 def main():
-    """Main function to send a single heartbeat."""
+    """Main function to send a single heartbeat, or keep sending them with --daemon."""
+    # Usage: heartbeat_monitor.py [--daemon [interval_seconds]]
+    daemon = len(sys.argv) > 1 and sys.argv[1] == '--daemon'
     try:
         monitor = HeartbeatMonitor()
+        
+        if daemon:
+            # Default to the cron cadence from config_heartbeat.json (6 hours)
+            try:
+                interval = int(sys.argv[2]) if len(sys.argv) > 2 else monitor.interval_seconds
+            except ValueError:
+                interval = 0
+            
+            # A zero or negative interval would fail in run_forever and crash-loop under systemd
+            if interval <= 0:
+                print("Usage: heartbeat_monitor.py [--daemon [interval_seconds]] (interval must be a positive integer)")
+                sys.exit(2)
+            monitor.run_forever(interval)
+        
         success = monitor.send_enhanced_heartbeat()
         
         if success:
@@ -3,7 +3,6 @@ Special Schedule Processor
 Downloads and processes special schedule PDFs identified by Lambda
 """
 import sys
-import boto3
 import json
 import logging
 import requests
@@ -13,7 +12,9 @@ from pathlib import Path
 # Add the project root to the path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from utils.aws import get_client
 from utils.config import load_config
+from utils.http_session import get_session
 from utils.logger import setup_logging
 
 def process_special_schedule(date_str, s3_client, config):
@@ -22,20 +23,11 @@ def process_special_schedule(date_str, s3_client, config):
     bucket = config['s3_bucket']
     
     try:
-        # Get special schedule info from Lambda output
-        info_key = f'lambda-outputs/schedule-info/{date_str}/special_schedule_info.json'
-        try:
-            response = s3_client.get_object(Bucket=bucket, Key=info_key)
-            schedule_info = json.loads(response['Body'].read().decode('utf-8'))
-        except s3_client.exceptions.NoSuchKey:
-            logger.info(f"No special schedule info found for {date_str}")
-            return True
-        
-        pdf_url = schedule_info['pdf_url']
         file_name = 'special_schedule.pdf'
         s3_key = f"schedules/special/{date_str}/{file_name}"
         
-        # Check if file already exists in S3
+        # Check if file already exists in S3 before fetching the schedule info,
+        # since the key only depends on the date
         try:
             s3_client.head_object(Bucket=bucket, Key=s3_key)
             logger.info(f"Special schedule PDF already exists for {date_str}")
@@ -45,22 +37,34 @@ def process_special_schedule(date_str, s3_client, config):
                 logger.error(f"S3 access error: {e}")
                 return False
         
-        # Download the PDF
-        headers = {'User-Agent': config['user_agent']}
-        response = requests.get(pdf_url, headers=headers, timeout=config['timeout_seconds'])
-        response.raise_for_status()
+        # Get special schedule info from Lambda output
+        info_key = f'lambda-outputs/schedule-info/{date_str}/special_schedule_info.json'
+        try:
+            response = s3_client.get_object(Bucket=bucket, Key=info_key)
+            schedule_info = json.loads(response['Body'].read())
+        except s3_client.exceptions.NoSuchKey:
+            logger.info(f"No special schedule info found for {date_str}")
+            return True
         
-        # Upload to S3
-        s3_client.put_object(
-            Bucket=bucket,
-            Key=s3_key,
-            Body=response.content,
-            ContentType='application/pdf',
-            Metadata={
-                'download-date': datetime.now().isoformat(),
-                'source-url': pdf_url
-            }
-        )
+        pdf_url = schedule_info['pdf_url']
+        
+        # Stream the PDF straight into S3
+        headers = {'User-Agent': config['user_agent']}
+        with get_session().get(pdf_url, headers=headers, timeout=config['timeout_seconds'], stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            s3_client.upload_fileobj(
+                response.raw,
+                bucket,
+                s3_key,
+                ExtraArgs={
+                    'ContentType': 'application/pdf',
+                    'Metadata': {
+                        'download-date': datetime.now().isoformat(),
+                        'source-url': pdf_url
+                    }
+                }
+            )
         logger.info(f"Successfully processed special schedule for {date_str}")
         return True
         
@@ -78,7 +82,7 @@ def main():
     logger = logging.getLogger('process_special_schedule')
     
     date_str = datetime.now().strftime('%Y-%m-%d')
-    s3_client = boto3.client('s3', region_name=config['aws_region'])
+    s3_client = get_client('s3', config['aws_region'])
     
     success = process_special_schedule(date_str, s3_client, config)
     if not success:
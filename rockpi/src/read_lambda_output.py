@@ -10,14 +10,19 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
-import boto3
+from botocore.config import Config
 
 # Add the project root to the path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from utils.aws import get_client
 from utils.config import load_config
 from utils.logger import setup_logging
 
+# A synchronous invoke waits for the whole Lambda run, so allow up to the
+# Lambda maximum instead of the shared 10s read timeout, and don't re-invoke
+LAMBDA_CLIENT_CONFIG = Config(read_timeout=900, retries={'max_attempts': 1, 'mode': 'adaptive'})
+
 def get_latest_schedule_info_from_s3(s3_client, bucket, date_str):
     """Get the latest schedule information from S3 saved by Lambda."""
     s3_key = f'lambda-outputs/schedule-info/{date_str}/schedule_info.json'
@@ -26,7 +31,7 @@ def get_latest_schedule_info_from_s3(s3_client, bucket, date_str):
         logging.info(f"Reading schedule information from S3: {s3_key}")
         response = s3_client.get_object(Bucket=bucket, Key=s3_key)
         
-        schedule_info = json.loads(response['Body'].read().decode('utf-8'))
+        schedule_info = json.loads(response['Body'].read())
         
         logging.info("Successfully loaded schedule information from Lambda output")
         logging.info(f"Lambda execution time: {schedule_info.get('currentTimestamp')}")
@@ -46,18 +51,18 @@ def get_latest_schedule_info_from_s3(s3_client, bucket, date_str):
 def check_lambda_execution_status(s3_client, bucket, date_str):
     """Check if Lambda has run for today and when."""
     try:
-        # List objects in the lambda outputs directory for today
-        prefix = f'lambda-outputs/schedule-info/{date_str}/'
-        response = s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-        
-        if 'Contents' in response:
-            latest_file = max(response['Contents'], key=lambda x: x['LastModified'])
-            logging.info(f"Lambda last ran at: {latest_file['LastModified']}")
-            return True
-        else:
-            logging.warning(f"No Lambda outputs found for {date_str}")
-            return False
+        # The Lambda writes a known key, so a HEAD on it is enough
+        s3_key = f'lambda-outputs/schedule-info/{date_str}/schedule_info.json'
+        response = s3_client.head_object(Bucket=bucket, Key=s3_key)
+        logging.info(f"Lambda last ran at: {response['LastModified']}")
+        return True
             
+    except s3_client.exceptions.ClientError as e:
+        if e.response['Error']['Code'] in ['404', 'NotFound']:
+            logging.warning(f"No Lambda outputs found for {date_str}")
+        else:
+            logging.error(f"Error checking Lambda execution status: {e}")
+        return False
     except Exception as e:
         logging.error(f"Error checking Lambda execution status: {e}")
         return False
@@ -74,7 +79,7 @@ def main():
     date_str = today.strftime('%Y-%m-%d')
     
     # Initialize S3 client
-    s3_client = boto3.client('s3', region_name=config['aws_region'])
+    s3_client = get_client('s3', config['aws_region'])
     bucket = config['s3_bucket']
     
     try:
@@ -83,7 +88,7 @@ def main():
             logging.error("Lambda hasn't run today. Attempting to trigger it...")
             
             # Try to invoke Lambda manually
-            lambda_client = boto3.client('lambda', region_name=config['aws_region'])
+            lambda_client = get_client('lambda', config['aws_region'], config=LAMBDA_CLIENT_CONFIG)
             try:
                 lambda_response = lambda_client.invoke(
                     FunctionName='GetScheduleInformation',
@@ -91,11 +96,10 @@ def main():
                     Payload='{}'
                 )
                 
+                # RequestResponse returns after the Lambda has written its output,
+                # and S3 reads are strongly consistent, so there is no need to wait
                 if lambda_response['StatusCode'] == 200:
                     logging.info("Successfully triggered Lambda execution")
-                    # Wait a moment for S3 to be consistent
-                    import time
-                    time.sleep(5)
                 else:
                     logging.error(f"Lambda invocation failed with status: {lambda_response['StatusCode']}")
                     sys.exit(1)
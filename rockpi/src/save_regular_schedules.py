@@ -6,20 +6,76 @@ Converted from SaveNewRegularSchedules Lambda function
 import json
 import logging
 import os
+import shutil
 import sys
+import tempfile
 import zipfile
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.parse import urlparse
 
-import boto3
-import requests
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 
 # Add the project root to the path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from utils.aws import get_client
 from utils.config import load_config
+from utils.http_session import get_session
 from utils.logger import setup_logging
 
+# S3 puts are I/O-bound, so upload the GTFS members concurrently
+UPLOAD_WORKERS = 8
+
+# Members over 5 MB (e.g. stop_times.txt) are sent as parallel 5 MB parts
+PART_CONCURRENCY = 8
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=5 * 1024 * 1024,
+    multipart_chunksize=5 * 1024 * 1024,
+    max_concurrency=PART_CONCURRENCY,
+    use_threads=True
+)
+
+# Size the connection pool for the upload workers plus multipart parts of large members
+S3_CLIENT_CONFIG = Config(max_pool_connections=UPLOAD_WORKERS * PART_CONCURRENCY)
+
+# Fetch an S3-hosted GTFS bundle as parallel byte ranges
+DOWNLOAD_CONFIG = TransferConfig(multipart_chunksize=8 * 1024 * 1024, max_concurrency=10, use_threads=True)
+
+def download_zip(zip_url, headers, timeout, s3_client, zip_file):
+    """Downloads the GTFS zip into zip_file, from S3 for s3:// URLs or over HTTP otherwise."""
+    if zip_url.startswith('s3://'):
+        parsed = urlparse(zip_url)
+        s3_client.download_fileobj(parsed.netloc, parsed.path.lstrip('/'), zip_file, Config=DOWNLOAD_CONFIG)
+    else:
+        with get_session().get(zip_url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            shutil.copyfileobj(response.raw, zip_file)
+    zip_file.seek(0)
+
+class NonSeekableReader:
+    """Read-only view of a stream that reports itself as non-seekable."""
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+
+    def read(self, size=-1):
+        return self._fileobj.read(size)
+
+    def seekable(self):
+        return False
+
+def upload_zip_member(z, file_info, s3_client, bucket, s3_key):
+    """Streams a single zip member into S3."""
+    # ZipExtFile reports itself seekable, so s3transfer would seek to the end to
+    # size it and rewind, decompressing the member twice; hide seek so the
+    # upload reads it once, chunk by chunk
+    with z.open(file_info) as file_data:
+        s3_client.upload_fileobj(NonSeekableReader(file_data), bucket, s3_key, Config=TRANSFER_CONFIG)
+    logging.info(f'Uploaded {file_info.filename} to {s3_key}')
+
 def main():
     """Main function to download and save regular schedules."""
     config = load_config()
@@ -34,7 +90,7 @@ def main():
         return
     
     # Initialize S3 client
-    s3_client = boto3.client('s3', region_name=config['aws_region'])
+    s3_client = get_client('s3', config['aws_region'], config=S3_CLIENT_CONFIG)
     bucket = config['s3_bucket']
     prefix = "gtfs/"
     zip_url = config['gtfs_zip_url']
@@ -46,34 +102,33 @@ def main():
             'User-Agent': config['user_agent'],
             'Accept': 'application/zip,application/octet-stream,*/*;q=0.9',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            # The zip is already compressed; override the session's default gzip/deflate
+            'Accept-Encoding': 'identity',
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         }
-        response = requests.get(zip_url, headers=headers, timeout=config['timeout_seconds'])
-        response.raise_for_status()
-        zip_bytes = BytesIO(response.content)
+        # Stream the archive into a temp file rather than holding the whole body in memory.
+        # SpooledTemporaryFile can't back a ZipFile before Python 3.11 (no seekable())
+        zip_file = tempfile.TemporaryFile()
+        download_zip(zip_url, headers, config['timeout_seconds'], s3_client, zip_file)
 
         # Extract and upload each file to S3
         logging.info('Extracting and uploading files to S3')
         files_uploaded = 0
         
-        with zipfile.ZipFile(zip_bytes) as z:
+        # ZipFile serializes member reads on its own lock, so workers can share it
+        with zip_file, zipfile.ZipFile(zip_file) as z, ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+            futures = []
             for file_info in z.infolist():
                 if file_info.is_dir():
                     continue
                 
-                file_data = z.read(file_info.filename)
                 s3_key = os.path.join(prefix, file_info.filename).replace('\\', '/')
-                
-                s3_client.put_object(
-                    Bucket=bucket,
-                    Key=s3_key,
-                    Body=file_data
-                )
-                
-                logging.info(f'Uploaded {file_info.filename} to {s3_key}')
+                futures.append(executor.submit(upload_zip_member, z, file_info, s3_client, bucket, s3_key))
+            
+            for future in as_completed(futures):
+                future.result()
                 files_uploaded += 1
         
         # Update metadata to mark as processed
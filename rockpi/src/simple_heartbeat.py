@@ -4,41 +4,43 @@ Simple Rock Pi Heartbeat Monitor
 Sends periodic heartbeat signals to AWS CloudWatch for monitoring uptime.
 """
 
-import boto3
 import json
 import os
 import sys
 import time
 from datetime import datetime, timezone
+from pathlib import Path
 from botocore.exceptions import ClientError, BotoCoreError
 
+# Add the project root to the path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.aws import get_client
+from utils.sysinfo import memory_used_percent, read_proc
+
+# Configuration, built once per process
+DEVICE_ID = os.environ.get('DEVICE_ID', 'rockpi-4b-plus-home')
+METRIC_NAMESPACE = 'RockPi/Heartbeat'
+DIMENSIONS = [{'Name': 'DeviceId', 'Value': DEVICE_ID}]
+
 def send_heartbeat():
     """Send a heartbeat metric to CloudWatch."""
     try:
         # AWS clients
-        cloudwatch = boto3.client('cloudwatch', region_name='us-east-1')
-        
-        # Configuration
-        device_id = 'rockpi-4b-plus-home'
-        metric_namespace = 'RockPi/Heartbeat'
-        metric_name = 'DeviceUptime'
+        cloudwatch = get_client('cloudwatch', 'us-east-1')
         
         timestamp = datetime.now(timezone.utc)
         
         # Send custom metric to CloudWatch
         response = cloudwatch.put_metric_data(
-            Namespace=metric_namespace,
+            Namespace=METRIC_NAMESPACE,
             MetricData=[
                 {
-                    'MetricName': metric_name,
-                    'Dimensions': [
-                        {
-                            'Name': 'DeviceId',
-                            'Value': device_id
-                        }
-                    ],
+                    'MetricName': 'DeviceUptime',
+                    'Dimensions': DIMENSIONS,
                     'Value': 1.0,  # Simple alive signal
                     'Unit': 'Count',
+                    'StorageResolution': 60,
                     'Timestamp': timestamp
                 }
             ]
@@ -54,28 +56,14 @@ def send_heartbeat():
 def get_system_info():
     """Get basic system information."""
     try:
-        # Get system uptime
-        with open('/proc/uptime', 'r') as f:
-            uptime_seconds = float(f.readline().split()[0])
-        
-        # Get load average
-        with open('/proc/loadavg', 'r') as f:
-            load_avg = f.readline().split()[:3]
-        
-        # Get memory info
-        memory_info = {}
-        with open('/proc/meminfo', 'r') as f:
-            for line in f:
-                if line.startswith(('MemTotal:', 'MemAvailable:')):
-                    key, value = line.split(':')
-                    memory_info[key.strip()] = int(value.strip().split()[0])
+        # Each /proc file fits in a single read
+        uptime_seconds = float(read_proc('/proc/uptime').split()[0])
+        load_avg = read_proc('/proc/loadavg').split()[:3]
         
         return {
             'uptime_hours': round(uptime_seconds / 3600, 2),
             'load_avg_1min': float(load_avg[0]),
-            'memory_used_percent': round(
-                (memory_info['MemTotal'] - memory_info['MemAvailable']) / memory_info['MemTotal'] * 100, 2
-            ) if 'MemTotal' in memory_info and 'MemAvailable' in memory_info else 0
+            'memory_used_percent': memory_used_percent(read_proc('/proc/meminfo'))
         }
     except Exception as e:
         print(f"⚠️ Could not gather system info: {e}")
@@ -84,19 +72,18 @@ def get_system_info():
 def send_enhanced_heartbeat():
     """Send heartbeat with additional system metrics."""
     try:
-        cloudwatch = boto3.client('cloudwatch', region_name='us-east-1')
+        cloudwatch = get_client('cloudwatch', 'us-east-1')
         
-        device_id = 'rockpi-4b-plus-home'
-        metric_namespace = 'RockPi/Heartbeat'
         timestamp = datetime.now(timezone.utc)
         system_info = get_system_info()
         
         metrics = [
             {
                 'MetricName': 'DeviceUptime',
-                'Dimensions': [{'Name': 'DeviceId', 'Value': device_id}],
+                'Dimensions': DIMENSIONS,
                 'Value': 1.0,
                 'Unit': 'Count',
+                'StorageResolution': 60,
                 'Timestamp': timestamp
             }
         ]
@@ -106,33 +93,36 @@ def send_enhanced_heartbeat():
             if 'uptime_hours' in system_info:
                 metrics.append({
                     'MetricName': 'SystemUptime',
-                    'Dimensions': [{'Name': 'DeviceId', 'Value': device_id}],
+                    'Dimensions': DIMENSIONS,
                     'Value': system_info['uptime_hours'],
                     'Unit': 'Count',
+                    'StorageResolution': 60,
                     'Timestamp': timestamp
                 })
             
             if 'load_avg_1min' in system_info:
                 metrics.append({
                     'MetricName': 'LoadAverage',
-                    'Dimensions': [{'Name': 'DeviceId', 'Value': device_id}],
+                    'Dimensions': DIMENSIONS,
                     'Value': system_info['load_avg_1min'],
                     'Unit': 'None',
+                    'StorageResolution': 60,
                     'Timestamp': timestamp
                 })
             
             if 'memory_used_percent' in system_info:
                 metrics.append({
                     'MetricName': 'MemoryUsagePercent',
-                    'Dimensions': [{'Name': 'DeviceId', 'Value': device_id}],
+                    'Dimensions': DIMENSIONS,
                     'Value': system_info['memory_used_percent'],
                     'Unit': 'Percent',
+                    'StorageResolution': 60,
                     'Timestamp': timestamp
                 })
         
         # Send all metrics in one API call
         response = cloudwatch.put_metric_data(
-            Namespace=metric_namespace,
+            Namespace=METRIC_NAMESPACE,
             MetricData=metrics
         )
         
@@ -147,6 +137,26 @@ def send_enhanced_heartbeat():
         # Fallback to simple heartbeat
         return send_heartbeat()
 
+def run_forever(interval):
+    """Send a heartbeat every interval seconds, reusing one client and connection."""
+    while True:
+        send_enhanced_heartbeat()
+        # Sleep to the next interval boundary so sends don't drift
+        time.sleep(interval - (time.time() % interval))
+
 if __name__ == '__main__':
+    # Usage: simple_heartbeat.py [--daemon [interval_seconds]]
+    if len(sys.argv) > 1 and sys.argv[1] == '--daemon':
+        try:
+            interval = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+        except ValueError:
+            interval = 0
+        
+        # A zero or negative interval would fail in run_forever and crash-loop under systemd
+        if interval <= 0:
+            print("Usage: simple_heartbeat.py [--daemon [interval_seconds]] (interval must be a positive integer)")
+            sys.exit(2)
+        run_forever(interval)
+    
     success = send_enhanced_heartbeat()
     sys.exit(0 if success else 1)
@@ -0,0 +1,34 @@
+"""
+AWS client utility
+"""
+
+import boto3
+from botocore.config import Config
+
+# Keep connections alive between calls, fail fast on a stalled connection
+# and back off adaptively when throttled
+CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=25,
+    connect_timeout=3,
+    read_timeout=10,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
+_session = None
+_clients = {}
+
+def get_client(service, region_name=None, config=None):
+    """Return a shared boto3 client for the service and region."""
+    global _session
+
+    # Clients built with different configs are cached separately; callers pass
+    # module-level Config constants, so the same override maps to the same client
+    key = (service, region_name, config)
+    if key not in _clients:
+        if _session is None:
+            _session = boto3.session.Session()
+        client_config = CLIENT_CONFIG.merge(config) if config else CLIENT_CONFIG
+        _clients[key] = _session.client(service, region_name=region_name, config=client_config)
+
+    return _clients[key]
@@ -5,6 +5,8 @@ Configuration loader utility
 import json
 from pathlib import Path
 
+CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config.json'
+
 _config_cache = None
 
 def load_config():
@@ -12,8 +14,7 @@ def load_config():
     global _config_cache
     
     if _config_cache is None:
-        config_path = Path(__file__).parent.parent / 'config.json'
-        with open(config_path, 'r') as f:
+        with CONFIG_PATH.open('rb') as f:
             _config_cache = json.load(f)
     
     return _config_cache
@@ -0,0 +1,24 @@
+"""
+HTTP session utility
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Retry transient failures with exponential backoff
+RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+
+_session = None
+
+def get_session():
+    """Return a shared requests session with keep-alive pooling and retries."""
+    global _session
+
+    if _session is None:
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=RETRY)
+        _session = requests.Session()
+        _session.mount('http://', adapter)
+        _session.mount('https://', adapter)
+
+    return _session
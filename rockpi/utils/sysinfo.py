@@ -0,0 +1,30 @@
+"""
+System information utility
+"""
+
+import os
+
+def read_proc(path):
+    """Read a /proc file with one open and one read."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 8192)
+    finally:
+        os.close(fd)
+
+def meminfo_kb(meminfo, key):
+    """Return the kB value for a key from raw /proc/meminfo bytes, or None if it is missing."""
+    start = meminfo.find(key)
+    if start == -1:
+        return None
+    start += len(key)
+    end = meminfo.find(b'\n', start)
+    return int(meminfo[start:end].split()[0])
+
+def memory_used_percent(meminfo):
+    """Return the percentage of memory in use, or 0 if /proc/meminfo lacks the fields."""
+    total = meminfo_kb(meminfo, b'MemTotal:')
+    available = meminfo_kb(meminfo, b'MemAvailable:')
+    if not total or available is None:
+        return 0
+    return round((total - available) / total * 100, 2)